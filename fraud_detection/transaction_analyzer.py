@@ -1,6 +1,51 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Dict, Set
+from typing import Any, Callable, List, Dict, Set, Tuple, Union
+
+# Width of the per-customer time buckets in the sorted transaction index
+INDEX_BUCKET_NS = 3_600_000_000_000  # one hour
+
+# Smallest number of rows worth handing to a separate scan thread
+PARALLEL_MIN_ROWS = 250_000
+
+def _window_starts(ts: np.ndarray, bucket_key: np.ndarray, bucket_span: int, window: int) -> np.ndarray:
+    """Find where the time window ending at each transaction starts.
+    
+    Args:
+        ts: Integer timestamps, sorted within each customer
+        bucket_key: Non-decreasing (customer, time bucket) key of each row
+        bucket_span: Number of buckets a window can reach back
+        window: Window length in the same unit as ts
+        
+    Returns:
+        np.ndarray: For each row, the index of the customer's earliest transaction
+            no more than `window` before it
+    """
+    # The window can only start in the row's own bucket or the bucket_span before it
+    lo = np.searchsorted(bucket_key, bucket_key - bucket_span, side='left')
+    hi = np.arange(len(ts))
+    target = ts - window
+    
+    # Binary search every row's bucket range at once for the first row at or after target
+    active = np.flatnonzero(lo < hi)
+    while len(active):
+        mid = (lo[active] + hi[active]) // 2
+        before = ts[mid] < target[active]
+        lo[active[before]] = mid[before] + 1
+        hi[active[~before]] = mid[~before]
+        active = active[lo[active] < hi[active]]
+    return lo
+
+
+def _available_cpus() -> int:
+    """Count the CPUs this process may run on, falling back to all CPUs."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
 
 class TransactionAnalyzer:
     def __init__(self, csv_path: str, config: Dict = None):
@@ -14,7 +59,14 @@ class TransactionAnalyzer:
         if not csv_path or not isinstance(csv_path, str):
             raise ValueError("CSV path must be a non-empty string")
             
-        self.df = pd.read_csv(csv_path)
+        # Declare the amount and text column types up front so the parser skips their
+        # type inference and builds the repeated strings directly as categoricals. The
+        # ID columns keep their inferred types, so numeric IDs stay numbers.
+        self.df = pd.read_csv(csv_path, dtype={
+            'amount': np.float64,
+            'location': 'category',
+            'merchant_category': 'category'
+        })
         if self.df.empty:
             raise ValueError("CSV file is empty")
             
@@ -23,11 +75,58 @@ class TransactionAnalyzer:
             missing = required_columns - set(self.df.columns)
             raise ValueError(f"Missing required columns: {missing}")
         
-        # Convert timestamp to datetime
+        # Categorical customer IDs, with categories of the inferred type
+        self.df['customer_id'] = self.df['customer_id'].astype('category')
+        
+        # Convert timestamp to datetime, and keep an int64 nanosecond copy for comparisons
         self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
+        self.ts_ns = self.df['timestamp'].dt.as_unit('ns').array.asi8
+        
+        # Categorical codes let equality checks and grouping work on small integers
+        self._cust_codes = self.df['customer_id'].cat.codes.to_numpy()
+        
+        # Transactions by each customer in each merchant category, counted at once by
+        # flattening (customer, category) code pairs into one bincount. Missing values
+        # have code -1 and are left out, as groupby would drop them.
+        customers = self.df['customer_id'].cat.categories
+        categories = self.df['merchant_category'].cat.categories
+        category_codes = self.df['merchant_category'].cat.codes.to_numpy()
+        has_customer = self._cust_codes >= 0
+        valid = has_customer & (category_codes >= 0)
+        flat = self._cust_codes[valid].astype(np.int64) * len(categories) + category_codes[valid]
+        counts = np.bincount(flat, minlength=len(customers) * len(categories))
+        self._count_matrix = pd.DataFrame(
+            counts.reshape(len(customers), len(categories)), index=customers, columns=categories
+        )
+        
+        # Row of each (customer, category) pair's first transaction, so ties in the
+        # counts can be broken in order of appearance, as value_counts breaks them
+        pairs, first_rows = np.unique(flat, return_index=True)
+        first_seen = np.full(len(customers) * len(categories), len(flat))
+        first_seen[pairs] = first_rows
+        self._first_seen_matrix = first_seen.reshape(len(customers), len(categories))
+        
+        # Amount spent by each customer in each merchant category; only observed pairs
+        # are grouped, unsorted, and the reindex lines the result up with the counts
+        self._amount_matrix = self.df.groupby(
+            ['customer_id', 'merchant_category'], sort=False, observed=True
+        )['amount'].sum().unstack(fill_value=0.0).reindex(
+            index=customers, columns=categories, fill_value=0.0
+        )
+        
+        # Per-customer totals still include rows without a merchant category
+        customer_codes = self._cust_codes[has_customer]
+        self._customer_totals = pd.DataFrame({
+            'total_transactions': np.bincount(customer_codes, minlength=len(customers)),
+            'total_amount': np.bincount(
+                customer_codes,
+                weights=np.nan_to_num(self.df['amount'].to_numpy(dtype=np.float64)[has_customer]),
+                minlength=len(customers)
+            )
+        }, index=customers)
         
         # Set up caching
-        self._merchant_counts_cache = {}
+        self._analysis_cache = None
         
         # Default configurations
         default_config = {
@@ -37,7 +136,8 @@ class TransactionAnalyzer:
             'travel_time_threshold_hours': 2,
             'high_risk_categories': ['Jewelry', 'Electronics'],
             'risk_threshold_percentage': 50.0,
-            'enable_caching': True
+            'enable_caching': True,
+            'max_workers': None  # threads for the sequence scans; None uses every available CPU
         }
         
         # Update configuration with provided values
@@ -53,147 +153,307 @@ class TransactionAnalyzer:
         self.HIGH_RISK_CATEGORIES = self.config['high_risk_categories']
         self.RISK_THRESHOLD = self.config['risk_threshold_percentage'] / 100.0
         
+        # Time thresholds in nanoseconds, matching self.ts_ns
+        self._rapid_window_ns = int(self.RAPID_TRANSACTION_WINDOW.total_seconds() * 1_000_000_000)
+        self._travel_threshold_ns = int(self.TRAVEL_TIME_THRESHOLD.total_seconds() * 1_000_000_000)
+        
+        # Sort and index the transactions once; the sequence-based checks share the result
+        self._build_index()
+        
     def find_high_value_transactions(self) -> pd.DataFrame:
         """Identify transactions above the high amount threshold."""
         return self.df[self.df['amount'] > self.HIGH_AMOUNT_THRESHOLD]
     
-    def find_rapid_transactions(self) -> Dict[str, List[Dict]]:
-        """Identify customers making many transactions in a short time period."""
-        suspicious_patterns = {}
-        
-        # Group by customer
-        for customer_id, transactions in self.df.groupby('customer_id'):
-            # Sort transactions by timestamp
-            sorted_txns = transactions.sort_values('timestamp')
-            
-            # Check each transaction window
-            for i in range(len(sorted_txns) - self.RAPID_TRANSACTION_COUNT + 1):
-                window = sorted_txns.iloc[i:i + self.RAPID_TRANSACTION_COUNT]
-                time_diff = window.iloc[-1]['timestamp'] - window.iloc[0]['timestamp']
-                
-                if time_diff <= self.RAPID_TRANSACTION_WINDOW:
-                    if customer_id not in suspicious_patterns:
-                        suspicious_patterns[customer_id] = []
-                    
-                    suspicious_patterns[customer_id].append({
-                        'transactions': window['transaction_id'].tolist(),
-                        'time_window': time_diff,
-                        'total_amount': window['amount'].sum()
-                    })
-        
-        return suspicious_patterns
+    def _sort_transactions(self) -> Dict[str, np.ndarray]:
+        """Get transaction columns as arrays sorted by customer and timestamp.
+        
+        Rows without a customer_id are left out, as a groupby by customer would drop
+        them, and so are rows without a timestamp, which can never fall inside a time
+        window or form a travel pair.
+        
+        Returns:
+            Dict: Column arrays keyed by column name, with timestamps as int64
+                nanoseconds, category codes under 'customer_code' and 'location_code',
+                and amount prefix sums under 'cum_amount'
+        """
+        order = np.lexsort((self.ts_ns, self._cust_codes))
+        has_timestamp = ~self.df['timestamp'].isna().to_numpy()
+        order = order[(self._cust_codes[order] >= 0) & has_timestamp[order]]
+        amount = self.df['amount'].to_numpy(dtype=np.float64)[order]
+        return {
+            'transaction_id': self.df['transaction_id'].to_numpy()[order],
+            'customer_id': self.df['customer_id'].to_numpy()[order],
+            'customer_code': self._cust_codes[order],
+            'timestamp': self.ts_ns[order],
+            'amount': amount,
+            # cum_amount[j] - cum_amount[i] is the total of rows i..j-1; missing amounts
+            # count as zero, as Series.sum would skip them
+            'cum_amount': np.concatenate(([0.0], np.cumsum(np.nan_to_num(amount)))),
+            'location': self.df['location'].to_numpy()[order],
+            'location_code': self.df['location'].cat.codes.to_numpy()[order]
+        }
     
-    def find_impossible_travel(self) -> List[Dict]:
-        """Identify transactions in different locations with impossible travel times."""
-        suspicious_travel = []
-        
-        # Group by customer
-        for customer_id, transactions in self.df.groupby('customer_id'):
-            # Sort transactions by timestamp
-            sorted_txns = transactions.sort_values('timestamp')
-            
-            # Compare consecutive transactions
-            for i in range(len(sorted_txns) - 1):
-                curr_txn = sorted_txns.iloc[i]
-                next_txn = sorted_txns.iloc[i + 1]
-                
-                if curr_txn['location'] != next_txn['location']:
-                    time_diff = next_txn['timestamp'] - curr_txn['timestamp']
-                    
-                    if time_diff < self.TRAVEL_TIME_THRESHOLD:
-                        suspicious_travel.append({
-                            'customer_id': customer_id,
-                            'transaction1': {
-                                'id': curr_txn['transaction_id'],
-                                'location': curr_txn['location'],
-                                'timestamp': curr_txn['timestamp']
-                            },
-                            'transaction2': {
-                                'id': next_txn['transaction_id'],
-                                'location': next_txn['location'],
-                                'timestamp': next_txn['timestamp']
-                            },
-                            'time_difference': time_diff
-                        })
-        
-        return suspicious_travel
+    def _build_index(self) -> None:
+        """Build the sorted transaction index shared by the sequence-based checks.
+        
+        Rows are sorted by customer and timestamp, and each customer's rows are
+        partitioned into time buckets so that a window lookup only searches the
+        buckets the window can overlap.
+        """
+        self._sorted = self._sort_transactions()
+        n = len(self._sorted['customer_code'])
+        self._group_starts = np.r_[
+            0, np.flatnonzero(np.diff(self._sorted['customer_code'])) + 1, n
+        ]
+        
+        # Store timestamps as ticks since the earliest transaction. Whole-second data
+        # spanning less than the int32 maximum in seconds fits in int32 seconds, halving
+        # the bytes the scans read; anything else keeps int64 nanoseconds. The span
+        # stays strictly below the maximum so that a threshold capped to it below still
+        # compares correctly. Only indexed rows are looked at, so a missing timestamp
+        # (NaT reads as the minimum int64) never becomes the origin or decides the unit.
+        ts_ns = self._sorted['timestamp']
+        self._time_origin_ns = int(ts_ns.min()) if n else 0
+        offsets = ts_ns - self._time_origin_ns
+        if ((offsets % 1_000_000_000 == 0).all()
+                and offsets.max(initial=0) // 1_000_000_000 < np.iinfo(np.int32).max):
+            self._time_unit_ns = 1_000_000_000
+            ts = (offsets // self._time_unit_ns).astype(np.int32)
+        else:
+            self._time_unit_ns = 1
+            ts = offsets
+        self._sorted['timestamp'] = ts
+        
+        # Thresholds in ticks; the rapid window is inclusive and travel is exclusive,
+        # and both are capped to stay inside the tick dtype
+        max_ticks = int(np.iinfo(ts.dtype).max)
+        self._rapid_window = min(self._rapid_window_ns // self._time_unit_ns, max_ticks)
+        self._travel_threshold = min(-(-self._travel_threshold_ns // self._time_unit_ns), max_ticks)
+        
+        # Number every (customer, bucket) pair in sorted order; each customer's keys are
+        # spaced far enough apart that looking back a full window never reaches the
+        # previous customer
+        bucket_ticks = INDEX_BUCKET_NS // self._time_unit_ns
+        self._bucket_span = -(-self._rapid_window // bucket_ticks)
+        buckets = ts.astype(np.int64) // bucket_ticks
+        stride = int(buckets.max(initial=0)) + 1 + self._bucket_span
+        self._bucket_key = self._sorted['customer_code'].astype(np.int64) * stride + buckets
+        
+        # Split the rows into contiguous ranges on customer boundaries; customers never
+        # span two ranges, so the ranges can be scanned independently
+        max_workers = self.config['max_workers'] or _available_cpus()
+        n_ranges = max(1, min(max_workers, n // PARALLEL_MIN_ROWS))
+        cuts = np.unique(self._group_starts[
+            np.searchsorted(self._group_starts, np.linspace(0, n, n_ranges + 1))
+        ])
+        self._scan_ranges = list(zip(cuts[:-1].tolist(), cuts[1:].tolist())) or [(0, 0)]
     
-    def _get_merchant_counts(self, customer_id: str, transactions: pd.DataFrame) -> pd.Series:
-        """Get cached merchant counts or compute them for a customer.
+    def _map_ranges(self, scan: Callable[[int, int], Any]) -> List:
+        """Run scan(lo, hi) over every customer-aligned row range of the index.
+        
+        Ranges are scanned on a thread pool when there are several. The scans spend
+        most of their time in NumPy calls over whole ranges, some of which release the
+        GIL, so how much the threads overlap depends on the NumPy build and the data.
         
         Args:
-            customer_id: The customer ID to get merchant counts for
-            transactions: The customer's transactions DataFrame
+            scan: Function taking the first and one-past-last row of a range
             
         Returns:
-            pd.Series: Count of transactions per merchant category
+            List: The scan results, in row order
         """
-        if not self.config['enable_caching'] or customer_id not in self._merchant_counts_cache:
-            self._merchant_counts_cache[customer_id] = transactions['merchant_category'].value_counts()
-        return self._merchant_counts_cache[customer_id]
-
-    def _calculate_risk_score(self, merchant_counts: pd.Series, transactions: pd.DataFrame) -> Dict:
-        """Calculate risk score based on both transaction count and amounts.
+        if len(self._scan_ranges) == 1:
+            return [scan(*self._scan_ranges[0])]
+        with ThreadPoolExecutor(max_workers=len(self._scan_ranges)) as executor:
+            return list(executor.map(lambda bounds: scan(*bounds), self._scan_ranges))
+    
+    def _as_timedelta(self, ticks: np.ndarray) -> np.ndarray:
+        """Convert index tick differences back to timedelta64[ns]."""
+        return (ticks.astype(np.int64) * self._time_unit_ns).astype('timedelta64[ns]')
+    
+    def _as_datetime(self, ticks: np.ndarray) -> Union[np.ndarray, pd.DatetimeIndex]:
+        """Convert index ticks back to datetime64[ns], in the timestamp column's time zone."""
+        values = (ticks.astype(np.int64) * self._time_unit_ns + self._time_origin_ns).astype('datetime64[ns]')
+        tz = self.df['timestamp'].dt.tz
+        if tz is None:
+            return values
+        # Ticks count from the UTC epoch for tz-aware columns
+        return pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(tz)
+    
+    def find_rapid_transactions(self) -> pd.DataFrame:
+        """Identify customers making many transactions in a short time period.
+        
+        Each reported burst is a maximal run of a customer's transactions that fits
+        inside the time window, so a long burst is reported once instead of as many
+        overlapping fixed-size windows.
+        
+        Returns:
+            pd.DataFrame: One row per burst with columns customer_id, start_idx,
+                end_idx, transaction_count, time_window and total_amount. Use
+                get_burst_transactions(start_idx, end_idx) to list its transaction IDs.
+        """
+        arrays = self._sorted
+        ts = arrays['timestamp']
+        cum_amount = arrays['cum_amount']
+        
+        bursts = self._map_ranges(self._scan_rapid_range)
+        start = np.concatenate([range_start for range_start, _ in bursts])
+        end = np.concatenate([range_end for _, range_end in bursts])
+        
+        return pd.DataFrame({
+            'customer_id': arrays['customer_id'][end],
+            'start_idx': start,
+            'end_idx': end,
+            'transaction_count': end - start + 1,
+            'time_window': self._as_timedelta(ts[end] - ts[start]),
+            # Window totals are one subtraction of the shared prefix sums
+            'total_amount': cum_amount[end + 1] - cum_amount[start]
+        })
+    
+    def _scan_rapid_range(self, lo: int, hi: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the maximal rapid-transaction bursts within one range of the index.
         
         Args:
-            merchant_counts: Count of transactions per merchant category
-            transactions: The customer's transactions DataFrame
+            lo: First row of the range, at a customer boundary
+            hi: One past the last row of the range, at a customer boundary
             
         Returns:
-            Dict: Risk calculation results including score and distribution
+            Tuple: Start and end rows of each burst
         """
-        total_transactions = len(transactions)
-        if total_transactions == 0:
-            return None
+        # Each customer's transactions are contiguous and in time order
+        ts = self._sorted['timestamp'][lo:hi]
+        window = self._rapid_window
+        
+        # Sliding window: for every right edge, the earliest transaction still inside it
+        left = _window_starts(ts, self._bucket_key[lo:hi], self._bucket_span, window)
+        right = np.arange(hi - lo)
+        
+        # A window is maximal when the customer's next transaction cannot join it
+        group_starts = self._group_starts
+        is_maximal = np.ones(hi - lo, dtype=bool)
+        is_maximal[:-1] = ts[1:] - ts[left[:-1]] > window
+        is_maximal[group_starts[(group_starts > lo) & (group_starts <= hi)] - 1 - lo] = True
+        end = np.flatnonzero(is_maximal & (right - left + 1 >= self.RAPID_TRANSACTION_COUNT))
+        return left[end] + lo, end + lo
+    
+    def get_burst_transactions(self, start_idx: int, end_idx: int) -> List[str]:
+        """Get the transaction IDs of a burst reported by find_rapid_transactions.
+        
+        Args:
+            start_idx: The burst's start_idx value
+            end_idx: The burst's end_idx value
             
-        total_amount = transactions['amount'].sum()
-        high_risk_count = 0
-        high_risk_amount = 0.0
-        
-        # Calculate risk based on both transaction count and amount
-        for category in self.HIGH_RISK_CATEGORIES:
-            if category in merchant_counts:
-                cat_transactions = transactions[transactions['merchant_category'] == category]
-                cat_count = len(cat_transactions)
-                cat_amount = cat_transactions['amount'].sum()
-                
-                high_risk_count += cat_count
-                high_risk_amount += cat_amount
+        Returns:
+            List[str]: Transaction IDs in time order
+        """
+        return self._sorted['transaction_id'][start_idx:end_idx + 1].tolist()
+    
+    def find_impossible_travel(self) -> pd.DataFrame:
+        """Identify transactions in different locations with impossible travel times.
         
-        if high_risk_count == 0:
-            return None
+        Returns:
+            pd.DataFrame: One row per pair of consecutive transactions with columns
+                customer_id, txn1_id, txn1_location, txn1_timestamp, txn2_id,
+                txn2_location, txn2_timestamp and time_difference
+        """
+        arrays = self._sorted
+        ts = arrays['timestamp']
+        loc = arrays['location']
+        tid = arrays['transaction_id']
+        
+        first = np.concatenate(self._map_ranges(self._scan_travel_range))
+        second = first + 1
+        dt = ts[second] - ts[first]
+        
+        return pd.DataFrame({
+            'customer_id': arrays['customer_id'][first],
+            'txn1_id': tid[first],
+            'txn1_location': loc[first],
+            'txn1_timestamp': self._as_datetime(ts[first]),
+            'txn2_id': tid[second],
+            'txn2_location': loc[second],
+            'txn2_timestamp': self._as_datetime(ts[second]),
+            'time_difference': self._as_timedelta(dt)
+        })
+    
+    def _scan_travel_range(self, lo: int, hi: int) -> np.ndarray:
+        """Find impossible-travel pairs within one range of the index.
+        
+        Args:
+            lo: First row of the range, at a customer boundary
+            hi: One past the last row of the range, at a customer boundary
             
-        risk_percentage = (high_risk_count / total_transactions) * 100
-        amount_percentage = (high_risk_amount / total_amount) * 100
+        Returns:
+            np.ndarray: Row of the first transaction of each pair
+        """
+        # Consecutive rows are consecutive transactions of one customer
+        ts = self._sorted['timestamp'][lo:hi]
+        loc_codes = self._sorted['location_code'][lo:hi]
+        
+        # Compare every transaction with the next one in a single pass
+        group_starts = self._group_starts
+        same_customer = np.ones(max(hi - lo - 1, 0), dtype=bool)
+        same_customer[group_starts[(group_starts > lo) & (group_starts < hi)] - 1 - lo] = False
+        diff_loc = loc_codes[1:] != loc_codes[:-1]
+        dt = ts[1:] - ts[:-1]
+        return np.flatnonzero(same_customer & diff_loc & (dt < self._travel_threshold)) + lo
+    
+    def _calculate_risk_scores(self) -> pd.DataFrame:
+        """Calculate risk scores for all customers based on transaction counts and amounts.
+        
+        Returns:
+            pd.DataFrame: Per-customer totals, high-risk totals and risk scores,
+                limited to customers with at least one high-risk transaction
+        """
+        merchant_counts = self._count_matrix.to_numpy()
+        high_risk_columns = self._count_matrix.columns.isin(self.HIGH_RISK_CATEGORIES)
+        amounts = self._amount_matrix.to_numpy()
+        
+        stats = pd.DataFrame({
+            'total_transactions': self._customer_totals['total_transactions'].to_numpy(),
+            'high_risk_transactions': merchant_counts[:, high_risk_columns].sum(axis=1),
+            'total_amount': self._customer_totals['total_amount'].to_numpy(),
+            'high_risk_amount': amounts[:, high_risk_columns].sum(axis=1)
+        }, index=self._count_matrix.index)
+        
+        stats['risk_percentage'] = stats['high_risk_transactions'] / stats['total_transactions'] * 100
+        stats['amount_percentage'] = stats['high_risk_amount'] / stats['total_amount'] * 100
         
         # Combined risk score weighs both transaction count and amount
-        risk_score = (risk_percentage + amount_percentage) / 2
+        stats['risk_score'] = (stats['risk_percentage'] + stats['amount_percentage']) / 2
         
-        return {
-            'total_transactions': total_transactions,
-            'high_risk_transactions': high_risk_count,
-            'total_amount': total_amount,
-            'high_risk_amount': high_risk_amount,
-            'merchant_distribution': merchant_counts.to_dict(),
-            'risk_percentage': risk_percentage,
-            'amount_percentage': amount_percentage,
-            'risk_score': risk_score
-        }
+        return stats[stats['high_risk_transactions'] > 0]
 
     def find_unusual_merchant_patterns(self) -> Dict[str, Dict]:
         """Identify customers making unusual patterns of purchases across merchant categories."""
         try:
             unusual_patterns = {}
             
-            # Group by customer
-            for customer_id, transactions in self.df.groupby('customer_id'):
-                # Get merchant categories for this customer
-                merchant_counts = self._get_merchant_counts(customer_id, transactions)
+            risk_scores = self._calculate_risk_scores()
+            flagged = risk_scores[risk_scores['risk_score'] > self.RISK_THRESHOLD]
+            
+            # Pull every column out as an array once instead of boxing a Series per row
+            columns = {column: flagged[column].to_numpy() for column in flagged.columns}
+            rows = self._count_matrix.index.get_indexer(flagged.index)
+            merchant_counts = self._count_matrix.to_numpy()
+            first_seen = self._first_seen_matrix
+            categories = self._count_matrix.columns.to_numpy()
+            
+            for i, customer_id in enumerate(flagged.index):
+                # Most frequent categories first and ties in order of appearance, as
+                # value_counts would order them
+                counts = merchant_counts[rows[i]]
+                observed = np.lexsort((first_seen[rows[i]], -counts))[:np.count_nonzero(counts)]
                 
-                # Calculate risk score
-                risk_data = self._calculate_risk_score(merchant_counts, transactions)
-                if risk_data and risk_data['risk_score'] > self.RISK_THRESHOLD:
-                    unusual_patterns[customer_id] = risk_data
+                unusual_patterns[customer_id] = {
+                    'total_transactions': int(columns['total_transactions'][i]),
+                    'high_risk_transactions': int(columns['high_risk_transactions'][i]),
+                    'total_amount': columns['total_amount'][i],
+                    'high_risk_amount': columns['high_risk_amount'][i],
+                    'merchant_distribution': dict(zip(categories[observed], counts[observed].tolist())),
+                    'risk_percentage': columns['risk_percentage'][i],
+                    'amount_percentage': columns['amount_percentage'][i],
+                    'risk_score': columns['risk_score'][i]
+                }
             
             return unusual_patterns
             
@@ -202,13 +462,22 @@ class TransactionAnalyzer:
             return {}
 
     def analyze_transactions(self) -> Dict:
-        """Run all fraud detection analyses and return results."""
-        return {
+        """Run all fraud detection analyses and return results.
+        
+        The rapid-transaction and travel checks share a single sorted copy of
+        the data, so the transactions are only sorted once per analyzer. Results
+        are cached when caching is enabled.
+        """
+        if self.config['enable_caching'] and self._analysis_cache is not None:
+            return self._analysis_cache
+        
+        self._analysis_cache = {
             'high_value_transactions': self.find_high_value_transactions().to_dict('records'),
             'rapid_transactions': self.find_rapid_transactions(),
             'impossible_travel': self.find_impossible_travel(),
             'unusual_merchant_patterns': self.find_unusual_merchant_patterns()
         }
+        return self._analysis_cache
 
 def main():
     # Initialize analyzer with sample data and custom configuration
@@ -233,20 +502,21 @@ def main():
                   f"in {txn['location']} at {txn['timestamp']}")
         
         print("\n2. Rapid Transactions:")
-        for customer_id, patterns in results['rapid_transactions'].items():
+        for customer_id, patterns in results['rapid_transactions'].groupby('customer_id', sort=False):
             print(f"\nCustomer {customer_id}:")
-            for pattern in patterns:
-                print(f"Made {len(pattern['transactions'])} transactions in "
-                      f"{pattern['time_window'].total_seconds()/60:.1f} minutes")
-                print(f"Transaction IDs: {', '.join(pattern['transactions'])}")
-                print(f"Total amount: ${pattern['total_amount']:.2f}")
+            for pattern in patterns.itertuples():
+                print(f"Made {pattern.transaction_count} transactions in "
+                      f"{pattern.time_window.total_seconds()/60:.1f} minutes")
+                transactions = analyzer.get_burst_transactions(pattern.start_idx, pattern.end_idx)
+                print(f"Transaction IDs: {', '.join(transactions)}")
+                print(f"Total amount: ${pattern.total_amount:.2f}")
         
         print("\n3. Impossible Travel Patterns:")
-        for travel in results['impossible_travel']:
-            print(f"\nCustomer {travel['customer_id']}:")
-            print(f"Transaction {travel['transaction1']['id']} in {travel['transaction1']['location']}")
-            print(f"Transaction {travel['transaction2']['id']} in {travel['transaction2']['location']}")
-            print(f"Time difference: {travel['time_difference'].total_seconds()/60:.1f} minutes")
+        for travel in results['impossible_travel'].itertuples():
+            print(f"\nCustomer {travel.customer_id}:")
+            print(f"Transaction {travel.txn1_id} in {travel.txn1_location}")
+            print(f"Transaction {travel.txn2_id} in {travel.txn2_location}")
+            print(f"Time difference: {travel.time_difference.total_seconds()/60:.1f} minutes")
         
         print("\n4. Unusual Merchant Patterns:")
         for customer_id, pattern in results['unusual_merchant_patterns'].items():
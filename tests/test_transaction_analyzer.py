@@ -0,0 +1,203 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'fraud_detection'))
+
+import transaction_analyzer
+from transaction_analyzer import TransactionAnalyzer
+
+
+def _write_log(tmp_path, n_rows=300, n_customers=6, minutes=600, seed=0, missing=False):
+    """Write a random transaction log with many timestamp ties and return its path."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'transaction_id': [f'TX{i:05d}' for i in range(n_rows)],
+        'customer_id': [f'CUST{c:02d}' for c in rng.integers(0, n_customers, n_rows)],
+        'timestamp': (
+            pd.Timestamp('2025-07-08')
+            + pd.to_timedelta(rng.integers(0, minutes, n_rows), unit='min')
+        ).strftime('%Y-%m-%dT%H:%M:%S'),
+        'amount': np.round(rng.uniform(1, 500, n_rows), 2),
+        'location': rng.choice(['New York', 'Las Vegas', 'Chicago'], n_rows),
+        'merchant_category': rng.choice(['Jewelry', 'Electronics', 'Grocery'], n_rows)
+    })
+    if missing:
+        df.loc[rng.choice(n_rows, 10, replace=False), 'amount'] = np.nan
+        df.loc[rng.choice(n_rows, 10, replace=False), 'timestamp'] = np.nan
+        df.loc[rng.choice(n_rows, 5, replace=False), 'customer_id'] = np.nan
+    path = tmp_path / 'log.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _brute_force_bursts(analyzer):
+    """Enumerate every maximal window of at least RAPID_TRANSACTION_COUNT transactions."""
+    df = analyzer.df.dropna(subset=['customer_id', 'timestamp'])
+    df = df.sort_values(['customer_id', 'timestamp'], kind='mergesort')
+    window = analyzer.RAPID_TRANSACTION_WINDOW
+    bursts = []
+    for customer_id, transactions in df.groupby('customer_id', observed=True):
+        ts = list(transactions['timestamp'])
+        ids = list(transactions['transaction_id'])
+        amounts = list(transactions['amount'])
+        for i in range(len(ts)):
+            for j in range(i, len(ts)):
+                if ts[j] - ts[i] > window:
+                    break
+                extends_right = j + 1 < len(ts) and ts[j + 1] - ts[i] <= window
+                extends_left = i > 0 and ts[j] - ts[i - 1] <= window
+                if not extends_right and not extends_left and j - i + 1 >= analyzer.RAPID_TRANSACTION_COUNT:
+                    bursts.append((customer_id, tuple(ids[i:j + 1]), ts[j] - ts[i],
+                                   round(pd.Series(amounts[i:j + 1]).sum(), 6)))
+    return bursts
+
+
+def _reported_bursts(analyzer):
+    return [
+        (burst.customer_id,
+         tuple(analyzer.get_burst_transactions(burst.start_idx, burst.end_idx)),
+         burst.time_window,
+         round(burst.total_amount, 6))
+        for burst in analyzer.find_rapid_transactions().itertuples()
+    ]
+
+
+def _brute_force_travel(analyzer):
+    """List consecutive same-customer pairs in different locations within the threshold."""
+    df = analyzer.df.dropna(subset=['customer_id', 'timestamp'])
+    df = df.sort_values(['customer_id', 'timestamp'], kind='mergesort')
+    pairs = []
+    for _, transactions in df.groupby('customer_id', observed=True):
+        rows = list(transactions.itertuples())
+        for curr, nxt in zip(rows, rows[1:]):
+            if curr.location != nxt.location and nxt.timestamp - curr.timestamp < analyzer.TRAVEL_TIME_THRESHOLD:
+                pairs.append((curr.transaction_id, nxt.transaction_id))
+    return pairs
+
+
+CONFIGS = [
+    {},
+    {'rapid_transaction_window_hours': 0.5},
+    {'rapid_transaction_window_hours': 3, 'rapid_transaction_count': 5},
+    {'rapid_transaction_window_hours': 0, 'rapid_transaction_count': 2},
+    {'rapid_transaction_count': 1},
+]
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+@pytest.mark.parametrize('missing', [False, True])
+def test_rapid_transactions_match_brute_force(tmp_path, config, missing):
+    analyzer = TransactionAnalyzer(_write_log(tmp_path, missing=missing), config)
+    assert _reported_bursts(analyzer) == _brute_force_bursts(analyzer)
+
+
+@pytest.mark.parametrize('missing', [False, True])
+def test_impossible_travel_matches_brute_force(tmp_path, missing):
+    analyzer = TransactionAnalyzer(_write_log(tmp_path, missing=missing))
+    travel = analyzer.find_impossible_travel()
+    assert list(zip(travel['txn1_id'], travel['txn2_id'])) == _brute_force_travel(analyzer)
+
+
+@pytest.mark.parametrize('config', CONFIGS)
+def test_multiple_scan_ranges_match_single_range(tmp_path, monkeypatch, config):
+    path = _write_log(tmp_path, n_customers=20, missing=True)
+    single = TransactionAnalyzer(path, dict(config, max_workers=1))
+    monkeypatch.setattr(transaction_analyzer, 'PARALLEL_MIN_ROWS', 10)
+    ranged = TransactionAnalyzer(path, dict(config, max_workers=4))
+    assert len(ranged._scan_ranges) > 1
+    pd.testing.assert_frame_equal(ranged.find_rapid_transactions(), single.find_rapid_transactions())
+    pd.testing.assert_frame_equal(ranged.find_impossible_travel(), single.find_impossible_travel())
+    assert _reported_bursts(ranged) == _brute_force_bursts(ranged)
+
+
+def test_missing_amount_does_not_spread_to_other_totals(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text(
+        'transaction_id,customer_id,timestamp,amount,location,merchant_category\n'
+        'T1,A,2025-07-08T09:00:00,,NY,Jewelry\n'
+        'T2,A,2025-07-08T09:10:00,4.0,NY,Jewelry\n'
+        'T3,A,2025-07-08T09:20:00,6.0,NY,Grocery\n'
+        'T4,B,2025-07-08T09:00:00,1.0,NY,Grocery\n'
+        'T5,B,2025-07-08T09:10:00,1.0,NY,Grocery\n'
+        'T6,B,2025-07-08T09:20:00,1.0,NY,Grocery\n'
+    )
+    bursts = TransactionAnalyzer(str(path)).find_rapid_transactions()
+    assert bursts['total_amount'].tolist() == [10.0, 3.0]
+
+
+def test_missing_timestamp_is_left_out_of_sequence_checks(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text(
+        'transaction_id,customer_id,timestamp,amount,location,merchant_category\n'
+        'T1,A,,5.0,NY,Jewelry\n'
+        'T2,A,2025-07-08T09:10:00,4.0,LA,Jewelry\n'
+        'T3,A,2025-07-08T09:20:00,6.0,LA,Grocery\n'
+        'T4,A,2025-07-08T09:30:00,1.0,SF,Grocery\n'
+    )
+    analyzer = TransactionAnalyzer(str(path))
+    bursts = analyzer.find_rapid_transactions()
+    assert [analyzer.get_burst_transactions(b.start_idx, b.end_idx) for b in bursts.itertuples()] == [['T2', 'T3', 'T4']]
+    travel = analyzer.find_impossible_travel()
+    assert list(zip(travel['txn1_id'], travel['txn2_id'])) == [('T3', 'T4')]
+
+
+@pytest.mark.parametrize('timestamps, unit_ns', [
+    (['2025-07-08T09:00:00', '2025-07-08T09:10:00', '', '2025-07-08T09:20:00'], 1_000_000_000),
+    (['2025-07-08T09:00:00.0', '2025-07-08T09:10:00.5', '', '2025-07-08T09:20:00.0'], 1),
+    (['1950-01-01T00:00:00', '2018-01-19T03:14:06', '', '2018-01-19T03:14:06'], 1_000_000_000),
+    (['1950-01-01T00:00:00', '2018-01-19T03:14:07', '', '2018-01-19T03:14:07'], 1),
+    (['1950-01-01T00:00:00', '2018-01-19T03:14:08', '', '2018-01-19T03:14:08'], 1),
+])
+def test_tick_unit_depends_only_on_indexed_timestamps(tmp_path, timestamps, unit_ns):
+    path = tmp_path / 'log.csv'
+    locations = ['NY', 'LA', 'NY', 'NY']
+    path.write_text(
+        'transaction_id,customer_id,timestamp,amount,location,merchant_category\n'
+        + ''.join(f'T{i},A,{ts},1.0,{loc},Grocery\n' for i, (ts, loc) in enumerate(zip(timestamps, locations)))
+    )
+    analyzer = TransactionAnalyzer(str(path), {'travel_time_threshold_hours': 1_000_000})
+    assert analyzer._time_unit_ns == unit_ns
+    assert analyzer._time_origin_ns == pd.Timestamp(timestamps[0]).value
+    travel = analyzer.find_impossible_travel()
+    first, second, fourth = (pd.Timestamp(timestamps[i]) for i in (0, 1, 3))
+    assert travel['txn1_timestamp'].tolist() == [first, second]
+    assert travel['txn2_timestamp'].tolist() == [second, fourth]
+    assert travel['time_difference'].tolist() == [second - first, fourth - second]
+
+
+def test_numeric_ids_keep_their_inferred_type(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text(
+        'transaction_id,customer_id,timestamp,amount,location,merchant_category\n'
+        '1,10,2025-07-08T09:00:00,5.0,NY,Jewelry\n'
+        '2,10,2025-07-08T09:10:00,4.0,LA,Jewelry\n'
+        '3,10,2025-07-08T09:20:00,6.0,LA,Grocery\n'
+    )
+    analyzer = TransactionAnalyzer(str(path))
+    bursts = analyzer.find_rapid_transactions()
+    assert bursts['customer_id'].tolist() == [10]
+    assert analyzer.get_burst_transactions(bursts['start_idx'][0], bursts['end_idx'][0]) == [1, 2, 3]
+    assert list(analyzer._calculate_risk_scores().index) == [10]
+
+
+def test_merchant_distribution_orders_ties_by_first_appearance(tmp_path):
+    path = tmp_path / 'log.csv'
+    path.write_text(
+        'transaction_id,customer_id,timestamp,amount,location,merchant_category\n'
+        'T1,A,2025-07-08T09:00:00,5.0,NY,Toys\n'
+        'T2,A,2025-07-08T10:00:00,5.0,NY,Jewelry\n'
+        'T3,A,2025-07-08T11:00:00,5.0,NY,Books\n'
+        'T4,A,2025-07-08T12:00:00,5.0,NY,Jewelry\n'
+        'T5,A,2025-07-08T13:00:00,5.0,NY,Books\n'
+        'T6,A,2025-07-08T14:00:00,5.0,NY,Toys\n'
+        'T7,A,2025-07-08T15:00:00,5.0,NY,Grocery\n'
+        'T8,A,2025-07-08T16:00:00,5.0,NY,Books\n'
+    )
+    patterns = TransactionAnalyzer(str(path), {'risk_threshold_percentage': 0.0}).find_unusual_merchant_patterns()
+    assert list(patterns['A']['merchant_distribution'].items()) == [
+        ('Books', 3), ('Toys', 2), ('Jewelry', 2), ('Grocery', 1)
+    ]